@@ -0,0 +1,59 @@
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from wallet.serialization import orjson, dumps, loads, join_fragments
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider using orjson when available, Flask's default otherwise"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, default=self.default, sort_keys=self.sort_keys).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        # Keep Flask's indented output in debug mode
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps(obj, default=self.default, sort_keys=self.sort_keys)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def _encode_object(items, sort_keys):
+    """Encode (key, encoded value) pairs as a JSON object"""
+    if sort_keys:
+        items = sorted(items, key=lambda item: item[0])
+    return b'{' + b','.join(dumps(key) + b':' + value for key, value in items) + b'}'
+
+def fragment_list_response(list_key, fragments, **data):
+    """Build a success response around a list of pre-encoded JSON fragments
+
+    The fragments are concatenated as bytes, so cached transaction
+    encodings are never decoded or re-encoded. Fragments must already use
+    sorted keys. In debug mode they are decoded so the response is
+    indented like every other endpoint.
+    """
+    provider = current_app.json
+    if (provider.compact is None and current_app.debug) or provider.compact is False:
+        return provider.response({
+            'success': True,
+            'data': dict(data, **{list_key: [loads(fragment) for fragment in fragments]})
+        })
+
+    items = [(list_key, join_fragments(fragments))]
+    items += [
+        (key, dumps(value, default=provider.default, sort_keys=provider.sort_keys))
+        for key, value in data.items()
+    ]
+
+    body = _encode_object([
+        ('success', b'true'),
+        ('data', _encode_object(items, provider.sort_keys))
+    ], provider.sort_keys)
+
+    return current_app.response_class(body, mimetype=provider.mimetype)
@@ -1,6 +1,9 @@
+import heapq
 from flask import Blueprint, request, jsonify
 from ledger.blockchain import ledger
 from ledger.consensus import consensus
+from wallet.address import AddressManager
+from api.json_provider import fragment_list_response
 import logging
 
 ledger_bp = Blueprint('ledger', __name__)
@@ -25,20 +28,15 @@ def get_all_transactions():
         limit = request.args.get('limit', 50, type=int)
         transactions = ledger.get_all_transactions()
         
-        # Sort by timestamp (newest first) and limit
-        transactions.sort(key=lambda x: x.timestamp, reverse=True)
-        transactions = transactions[:limit]
+        # Newest first, without sorting the ledger itself
+        newest = heapq.nlargest(max(limit, 0), transactions, key=lambda x: x.timestamp)
         
-        # Convert to dict format
-        tx_data = [tx.to_dict() for tx in transactions]
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'transactions': tx_data,
-                'total': len(ledger.get_all_transactions())
-            }
-        })
+        # Confirmed transactions serve their cached JSON encoding
+        return fragment_list_response(
+            'transactions',
+            [tx.to_json() for tx in newest],
+            total=len(transactions)
+        )
     except Exception as e:
         logging.error(f"Error getting transactions: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -105,6 +103,52 @@ def get_nodes():
         logging.error(f"Error getting nodes info: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@ledger_bp.route('/state', methods=['GET'])
+def get_state_root():
+    """Get the Merkle state commitment over balances and transactions"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': ledger.get_state_root()
+        })
+    except Exception as e:
+        logging.error(f"Error getting state root: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@ledger_bp.route('/state/proof/<address>', methods=['GET'])
+def get_balance_proof(address):
+    """Get a balance with a Merkle inclusion proof for light clients"""
+    try:
+        if address != 'genesis' and not AddressManager.is_valid_address(address):
+            return jsonify({'success': False, 'error': 'Invalid address format'}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': ledger.get_balance_proof(address)
+        })
+    except Exception as e:
+        logging.error(f"Error getting balance proof: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@ledger_bp.route('/state/node', methods=['GET'])
+def get_state_node():
+    """Get a balance tree node by bit path for replica divergence search"""
+    try:
+        path = request.args.get('path', '')
+        
+        try:
+            node = ledger.get_state_node(path)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': node
+        })
+    except Exception as e:
+        logging.error(f"Error getting state node: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @ledger_bp.route('/faucet', methods=['POST'])
 def faucet():
     """Faucet to get test coins (educational purposes)"""
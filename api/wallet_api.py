@@ -1,13 +1,23 @@
+import os
 from flask import Blueprint, request, jsonify
 from wallet.keys import KeyManager
 from wallet.address import AddressManager
 from wallet.transaction import Transaction
+from wallet.hd import wallet_registry
+from wallet.serialization import extend_fragment
+from api.json_provider import fragment_list_response
 from ledger.blockchain import ledger
 from ledger.consensus import consensus
 import logging
 
 wallet_bp = Blueprint('wallet', __name__)
 
+# Upper bound on accounts derived by a single batch request
+MAX_DERIVE_BATCH = 10000
+
+# Worker processes for large derivation batches (0 derives in-process)
+DERIVE_PROCESSES = int(os.environ.get("DERIVE_PROCESSES", "0"))
+
 @wallet_bp.route('/generate', methods=['POST'])
 def generate_wallet():
     """Generate a new wallet keypair and address"""
@@ -66,6 +76,78 @@ def import_wallet():
         logging.error(f"Error importing wallet: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@wallet_bp.route('/derive', methods=['POST'])
+def derive_account():
+    """Derive the account at an index of a deterministic wallet seed"""
+    try:
+        data = request.get_json()
+        
+        if 'seed' not in data:
+            return jsonify({'success': False, 'error': 'Seed required'}), 400
+        
+        try:
+            wallet = wallet_registry.get_wallet(data['seed'])
+            account = wallet.derive(int(data.get('index', 0)))
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': dict(account, wallet_id=wallet.wallet_id)
+        })
+    except Exception as e:
+        logging.error(f"Error deriving account: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@wallet_bp.route('/derive/batch', methods=['POST'])
+def derive_accounts():
+    """Derive a range of indexed accounts from a deterministic wallet seed"""
+    try:
+        data = request.get_json()
+        
+        if 'seed' not in data:
+            return jsonify({'success': False, 'error': 'Seed required'}), 400
+        
+        try:
+            start = int(data.get('start', 0))
+            count = int(data.get('count', 100))
+            if not 0 < count <= MAX_DERIVE_BATCH:
+                return jsonify({'success': False, 'error': f'Count must be between 1 and {MAX_DERIVE_BATCH}'}), 400
+            
+            wallet = wallet_registry.get_wallet(data['seed'])
+            accounts = wallet.derive_batch(start, count, processes=DERIVE_PROCESSES)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'wallet_id': wallet.wallet_id,
+                'start': start,
+                'count': len(accounts),
+                'accounts': accounts
+            }
+        })
+    except Exception as e:
+        logging.error(f"Error deriving accounts: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@wallet_bp.route('/lookup/<address>', methods=['GET'])
+def lookup_address(address):
+    """Resolve a derived address to its deterministic wallet and index"""
+    try:
+        account = wallet_registry.resolve(address)
+        if account is None:
+            return jsonify({'success': False, 'error': 'Address not derived by any registered wallet'}), 404
+        
+        return jsonify({
+            'success': True,
+            'data': account
+        })
+    except Exception as e:
+        logging.error(f"Error looking up address: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @wallet_bp.route('/balance/<address>', methods=['GET'])
 def get_balance(address):
     """Get balance for an address"""
@@ -96,21 +178,14 @@ def get_transaction_history(address):
         limit = request.args.get('limit', 10, type=int)
         transactions = ledger.get_transaction_history(address, limit)
         
-        # Convert transactions to dict format
+        # Encode transactions and add transaction type for display
+        # ('type' sorts after every transaction field, keeping keys sorted)
         tx_data = []
         for tx in transactions:
-            tx_dict = tx.to_dict()
-            # Add transaction type for display
-            tx_dict['type'] = 'sent' if tx.from_address == address else 'received'
-            tx_data.append(tx_dict)
+            tx_type = 'sent' if tx.from_address == address else 'received'
+            tx_data.append(extend_fragment(tx.to_json(), type=tx_type))
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'address': address,
-                'transactions': tx_data
-            }
-        })
+        return fragment_list_response('transactions', tx_data, address=address)
     except Exception as e:
         logging.error(f"Error getting transaction history: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -3,6 +3,7 @@ import logging
 from flask import Flask, render_template, jsonify, request
 from api.wallet_api import wallet_bp
 from api.ledger_api import ledger_bp
+from api.json_provider import FastJSONProvider
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -11,6 +12,9 @@ logging.basicConfig(level=logging.DEBUG)
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-for-demo")
 
+# Use orjson for responses when it is installed
+app.json = FastJSONProvider(app)
+
 # Register blueprints
 app.register_blueprint(wallet_bp, url_prefix='/api/wallet')
 app.register_blueprint(ledger_bp, url_prefix='/api/ledger')
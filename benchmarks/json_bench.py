@@ -0,0 +1,78 @@
+"""Benchmark transaction list serialization: response size versus latency
+
+Compares Flask's default provider encoding to_dict() output against
+concatenating cached per-transaction JSON fragments.
+
+Usage: python -m benchmarks.json_bench [--sizes 10,100,1000,10000] [--repeat 20]
+"""
+import argparse
+import time
+from app import app
+from flask.json.provider import DefaultJSONProvider
+from api.json_provider import fragment_list_response
+from wallet.serialization import orjson
+from wallet.transaction import Transaction
+
+def make_transactions(count):
+    """Build confirmed transactions with realistic field sizes"""
+    transactions = []
+    for i in range(count):
+        tx = Transaction(f"fba_{i:040d}", f"fba_{i + 1:040d}", 1.5 + i, 1700000000 + i)
+        tx.hash = tx.calculate_hash()
+        tx.signature = tx.hash * 2
+        tx.mark_confirmed()
+        transactions.append(tx)
+    return transactions
+
+def best_of(func, repeat):
+    """Get the fastest of repeated runs in milliseconds, plus the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def run(sizes, repeat):
+    default_provider = DefaultJSONProvider(app)
+
+    print(f"orjson available: {orjson is not None}")
+    print(f"{'txs':>7} {'bytes':>11} {'default ms':>11} {'fast ms':>9} {'cold ms':>9} {'speedup':>8}")
+
+    with app.app_context():
+        for size in sizes:
+            transactions = make_transactions(size)
+
+            def default_response():
+                return default_provider.response({
+                    'success': True,
+                    'data': {
+                        'transactions': [tx.to_dict() for tx in transactions],
+                        'total': size
+                    }
+                })
+
+            def fast_response():
+                return fragment_list_response(
+                    'transactions', [tx.to_json() for tx in transactions], total=size
+                )
+
+            def cold_response():
+                for tx in transactions:
+                    tx.clear_json_cache()
+                return fast_response()
+
+            default_ms, response = best_of(default_response, repeat)
+            cold_ms, _ = best_of(cold_response, repeat)
+            fast_ms, _ = best_of(fast_response, repeat)
+
+            print(f"{size:>7} {len(response.get_data()):>11,} {default_ms:>11.2f} "
+                  f"{fast_ms:>9.2f} {cold_ms:>9.2f} {default_ms / fast_ms:>7.1f}x")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='10,100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    run([int(size) for size in args.sizes.split(',')], args.repeat)
@@ -0,0 +1,51 @@
+"""Benchmark memory and false-positive rate of the seen-transaction index
+
+Usage: python -m benchmarks.seen_index_bench [--count 10000000] [--probes 100000]
+"""
+import argparse
+import hashlib
+import time
+from ledger.seen_index import SeenTransactionIndex
+
+def fake_hash(i, salt=b'seen'):
+    """Generate a deterministic transaction-like hex hash"""
+    return hashlib.sha256(salt + i.to_bytes(8, 'big')).hexdigest()
+
+def run(count, probes, window_size, error_rate):
+    """Insert count hashes, then probe with unseen hashes"""
+    index = SeenTransactionIndex(window_size=window_size, error_rate=error_rate)
+
+    start = time.perf_counter()
+    for i in range(count):
+        index.add(fake_hash(i))
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    false_positives = sum(
+        1 for i in range(probes) if index.might_contain(fake_hash(i, b'probe'))
+    )
+    probe_time = time.perf_counter() - start
+
+    stats = index.get_stats()
+    # A plain set of 64-char hex strings costs roughly this much per entry
+    set_bytes = count * (113 + 40)
+
+    print(f"transactions:              {count:,}")
+    print(f"insert rate:               {count / insert_time:,.0f} tx/s")
+    print(f"lookup rate:               {probes / probe_time:,.0f} lookups/s")
+    print(f"bloom slices:              {stats['bloom_slices']}")
+    print(f"bloom memory:              {stats['bloom_memory_bytes'] / 2**20:,.1f} MiB")
+    print(f"window memory (approx):    {stats['window_memory_bytes'] / 2**20:,.1f} MiB")
+    print(f"exact set memory (approx): {set_bytes / 2**20:,.1f} MiB")
+    print(f"estimated FP rate:         {stats['estimated_false_positive_rate']:.2e}")
+    print(f"measured FP rate:          {false_positives / probes:.2e} ({false_positives}/{probes})")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=10_000_000)
+    parser.add_argument('--probes', type=int, default=100_000)
+    parser.add_argument('--window-size', type=int, default=100_000)
+    parser.add_argument('--error-rate', type=float, default=1e-6)
+    args = parser.parse_args()
+
+    run(args.count, args.probes, args.window_size, args.error_rate)
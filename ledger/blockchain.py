@@ -2,6 +2,8 @@ import json
 import time
 from collections import defaultdict
 from wallet.transaction import Transaction
+from ledger.seen_index import SeenTransactionIndex
+from ledger.merkle import SparseMerkleTree, IncrementalMerkleTree, state_root
 
 class SimpleLedger:
     """Simple in-memory ledger for educational purposes"""
@@ -10,9 +12,18 @@ class SimpleLedger:
         self.transactions = []
         self.balances = defaultdict(float)
         self.pending_transactions = []
+        self.pending_hashes = set()
+        
+        # Hashes of confirmed transactions for replay detection
+        self.seen = SeenTransactionIndex()
+        
+        # Merkle commitments over balances and confirmed transactions
+        self.balance_tree = SparseMerkleTree()
+        self.transaction_tree = IncrementalMerkleTree()
         
         # Initialize with some genesis balance for demo
         self.balances['genesis'] = 1000000.0
+        self._commit_balance('genesis')
     
     def add_transaction(self, transaction):
         """Add a validated transaction to the ledger"""
@@ -24,25 +35,46 @@ class SimpleLedger:
         if transaction.from_address != 'genesis':
             self.balances[transaction.from_address] -= transaction.amount
         self.balances[transaction.to_address] += transaction.amount
+        self._commit_balance(transaction.from_address)
+        self._commit_balance(transaction.to_address)
         
         # Add to ledger
+        transaction.mark_confirmed()
         self.transactions.append(transaction)
+        self.seen.add(transaction.hash)
+        self.transaction_tree.append(transaction.hash)
         
         # Remove from pending if exists
-        self.pending_transactions = [
-            tx for tx in self.pending_transactions 
-            if tx.hash != transaction.hash
-        ]
+        if transaction.hash in self.pending_hashes:
+            self.pending_hashes.discard(transaction.hash)
+            self.pending_transactions = [
+                tx for tx in self.pending_transactions 
+                if tx.hash != transaction.hash
+            ]
         
         return True
     
     def add_pending_transaction(self, transaction):
         """Add transaction to pending pool"""
+        if transaction.hash in self.pending_hashes:
+            return False
+        
         if self.validate_transaction(transaction):
             self.pending_transactions.append(transaction)
+            self.pending_hashes.add(transaction.hash)
             return True
         return False
     
+    def is_replay(self, transaction):
+        """Check if a transaction hash was already confirmed
+        
+        Hits outside the exact recent window come from the Bloom filter and
+        are rejected as well, so a valid transaction is refused with at most
+        the reported false-positive rate. Those hits are counted as
+        bloom_only_hits in get_ledger_stats().
+        """
+        return self.seen.check(transaction.hash)
+    
     def validate_transaction(self, transaction):
         """Validate a transaction"""
         # Check if sender has sufficient balance (except genesis)
@@ -58,12 +90,74 @@ class SimpleLedger:
         if not transaction.hash or not transaction.signature:
             return False
         
+        # Reject replays of already confirmed transactions
+        if self.is_replay(transaction):
+            return False
+        
         return True
     
     def get_balance(self, address):
         """Get balance for an address"""
         return self.balances.get(address, 0.0)
     
+    @staticmethod
+    def encode_balance(balance):
+        """Encode a balance as a Merkle leaf value (zero is an empty leaf)"""
+        if not balance:
+            return None
+        return repr(float(balance)).encode('utf-8')
+    
+    def _commit_balance(self, address):
+        """Update the balance tree leaf for an address"""
+        self.balance_tree.update(address, self.encode_balance(self.balances.get(address, 0.0)))
+    
+    def get_state_root(self):
+        """Get the state commitment over balances and transactions"""
+        balances_root = self.balance_tree.root()
+        transactions_root = self.transaction_tree.root()
+        
+        return {
+            'state_root': state_root(balances_root, transactions_root).hex(),
+            'balances_root': balances_root.hex(),
+            'transactions_root': transactions_root.hex(),
+            'transaction_count': self.transaction_tree.size
+        }
+    
+    def get_balance_proof(self, address):
+        """Get a balance with its inclusion proof against the current roots"""
+        roots = self.get_state_root()
+        
+        return {
+            'address': address,
+            'balance': self.get_balance(address),
+            'balances_root': roots['balances_root'],
+            'transactions_root': roots['transactions_root'],
+            'state_root': roots['state_root'],
+            'proof': self.balance_tree.get_proof(address)
+        }
+    
+    @staticmethod
+    def verify_balance_proof(response):
+        """Verify a get_balance_proof response without trusting the node"""
+        try:
+            roots_match = state_root(
+                bytes.fromhex(response['balances_root']),
+                bytes.fromhex(response['transactions_root'])
+            ).hex() == response['state_root']
+        except (KeyError, ValueError):
+            return False
+        
+        return roots_match and SparseMerkleTree.verify_proof(
+            response['balances_root'],
+            response['address'],
+            SimpleLedger.encode_balance(response['balance']),
+            response['proof']
+        )
+    
+    def get_state_node(self, path_bits=''):
+        """Get a balance tree node for replica divergence search"""
+        return self.balance_tree.get_node(path_bits)
+    
     def get_transaction_history(self, address, limit=10):
         """Get transaction history for an address"""
         relevant_transactions = [
@@ -94,7 +188,8 @@ class SimpleLedger:
             'pending_transactions': len(self.pending_transactions),
             'total_supply': total_supply,
             'active_addresses': active_addresses,
-            'total_addresses': len(self.balances)
+            'total_addresses': len(self.balances),
+            'seen_index': self.seen.get_stats()
         }
 
 # Global ledger instance
@@ -1,6 +1,7 @@
 import time
 import random
 from collections import defaultdict
+from ledger.simulation import NetworkSimulator, SimulationConfig
 
 class FBAConsensus:
     """Educational FBA consensus simulation"""
@@ -102,6 +103,10 @@ class FBAConsensus:
     def get_quorum_slices(self):
         """Get quorum slice configuration"""
         return self.quorum_slices
+    
+    def simulate_network(self, **config):
+        """Run a network-scale simulation with synthetic nodes (requires numpy)"""
+        return NetworkSimulator(SimulationConfig(**config)).run()
 
 # Global consensus instance
 consensus = FBAConsensus()
@@ -0,0 +1,277 @@
+import hashlib
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+STATE_PREFIX = b'\x02'
+
+def _hash(data):
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+def _hash_node(left, right):
+    return _hash(NODE_PREFIX + left + right)
+
+class _Leaf:
+    """Subtree holding a single key, stored at the depth where it diverges"""
+
+    __slots__ = ('path', 'key', 'value', 'hash')
+
+    def __init__(self, path, key, value):
+        self.path = path
+        self.key = key
+        self.value = value
+        self.hash = SparseMerkleTree.leaf_hash(key, value)
+
+class _Branch:
+    """Subtree holding two or more keys"""
+
+    __slots__ = ('left', 'right', 'hash')
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        self.hash = _hash_node(_node_hash(left), _node_hash(right))
+
+def _node_hash(node):
+    return SparseMerkleTree.EMPTY if node is None else node.hash
+
+class SparseMerkleTree:
+    """Sparse Merkle tree over a 256-bit key space with compressed leaves
+
+    Keys are hashed to 256-bit paths. An empty subtree hashes to EMPTY and
+    a subtree holding a single key hashes to that key's leaf hash, so each
+    leaf sits just below the point where its path diverges from all other
+    keys. Storage is O(n) and updates and proofs touch O(log n) nodes.
+    """
+
+    DEPTH = 256
+    EMPTY = b'\x00' * 32
+
+    def __init__(self):
+        self.root_node = None
+
+    @staticmethod
+    def key_path(key):
+        """Map a key to its 256-bit path"""
+        return int.from_bytes(_hash(key.encode('utf-8')), 'big')
+
+    @staticmethod
+    def leaf_hash(key, value):
+        """Hash a leaf, empty values map to the empty subtree"""
+        if value is None:
+            return SparseMerkleTree.EMPTY
+        return _hash(LEAF_PREFIX + key.encode('utf-8') + b'\x00' + value)
+
+    @classmethod
+    def _bit(cls, path, depth):
+        """Get the branch direction of a path at a depth (0 is the root)"""
+        return (path >> (cls.DEPTH - 1 - depth)) & 1
+
+    def root(self):
+        """Get the current root hash"""
+        return _node_hash(self.root_node)
+
+    def update(self, key, value):
+        """Set the value bytes for a key (None removes it)"""
+        path = self.key_path(key)
+        leaf = None if value is None else _Leaf(path, key, value)
+        self.root_node = self._update(self.root_node, 0, path, leaf)
+        return self.root()
+
+    def _update(self, node, depth, path, leaf):
+        if node is None:
+            return leaf
+
+        if isinstance(node, _Leaf):
+            if node.path == path:
+                return leaf
+            if leaf is None:
+                return node
+            return self._split(node, leaf, depth)
+
+        if self._bit(path, depth):
+            return self._branch(node.left, self._update(node.right, depth + 1, path, leaf))
+        return self._branch(self._update(node.left, depth + 1, path, leaf), node.right)
+
+    @staticmethod
+    def _branch(left, right):
+        """Build a branch, collapsing subtrees left with a single key"""
+        if left is None and (right is None or isinstance(right, _Leaf)):
+            return right
+        if right is None and isinstance(left, _Leaf):
+            return left
+        return _Branch(left, right)
+
+    def _split(self, existing, leaf, depth):
+        """Push two leaves down until their paths diverge"""
+        existing_bit = self._bit(existing.path, depth)
+        if existing_bit == self._bit(leaf.path, depth):
+            child = self._split(existing, leaf, depth + 1)
+            return _Branch(None, child) if existing_bit else _Branch(child, None)
+
+        return _Branch(leaf, existing) if existing_bit else _Branch(existing, leaf)
+
+    def get_proof(self, key):
+        """Get a compressed proof for a key's value or absence
+
+        Siblings are listed root-to-leaf; empty siblings are omitted and
+        flagged by a zero bit in the bitmap. If the path ends at another
+        key's leaf, that leaf's key and value are included to prove absence.
+        """
+        path = self.key_path(key)
+        node = self.root_node
+        depth = 0
+        bitmap = 0
+        siblings = []
+
+        while isinstance(node, _Branch):
+            if self._bit(path, depth):
+                sibling, node = node.left, node.right
+            else:
+                sibling, node = node.right, node.left
+            if sibling is not None:
+                bitmap |= 1 << depth
+                siblings.append(sibling.hash.hex())
+            depth += 1
+
+        proof = {
+            'key': key,
+            'depth': depth,
+            'bitmap': format(bitmap, 'x'),
+            'siblings': siblings
+        }
+
+        if isinstance(node, _Leaf) and node.path != path:
+            proof['leaf'] = {'key': node.key, 'value': node.value.hex()}
+
+        return proof
+
+    @classmethod
+    def compute_root(cls, key, value, proof):
+        """Recompute the root implied by a proof for the given value"""
+        path = cls.key_path(key)
+        depth = int(proof['depth'])
+        bitmap = int(proof['bitmap'], 16)
+        siblings = list(proof['siblings'])
+        if not 0 <= depth <= cls.DEPTH or bitmap >> depth:
+            raise ValueError("Invalid proof")
+
+        if 'leaf' in proof:
+            # Absence: another key's leaf occupies this path prefix. Its hash
+            # is recomputed from its value so a branch hash cannot pose as it
+            other_key = proof['leaf']['key']
+            other_value = bytes.fromhex(proof['leaf']['value'])
+            other_path = cls.key_path(other_key)
+            shift = cls.DEPTH - depth
+            if value is not None or not other_value or other_key == key or other_path >> shift != path >> shift:
+                raise ValueError("Invalid proof")
+            node_hash = cls.leaf_hash(other_key, other_value)
+        else:
+            node_hash = cls.leaf_hash(key, value)
+
+        for level in range(depth - 1, -1, -1):
+            if bitmap & (1 << level):
+                sibling = bytes.fromhex(siblings.pop())
+            else:
+                sibling = cls.EMPTY
+            if cls._bit(path, level):
+                node_hash = _hash_node(sibling, node_hash)
+            else:
+                node_hash = _hash_node(node_hash, sibling)
+
+        if siblings:
+            raise ValueError("Invalid proof")
+        return node_hash
+
+    @classmethod
+    def verify_proof(cls, root_hex, key, value, proof):
+        """Verify that key maps to value (None for absent) under the given root"""
+        try:
+            return cls.compute_root(key, value, proof).hex() == root_hex
+        except (KeyError, ValueError, TypeError, IndexError):
+            return False
+
+    def get_node(self, path_bits):
+        """Get the subtree at a path, e.g. '0110'
+
+        Branches report their children's hashes. Replicas compare these
+        top-down and stop at the first leaf or empty subtree, so locating a
+        diverging key takes O(log n) round trips.
+        """
+        depth = len(path_bits)
+        if depth > self.DEPTH or any(bit not in '01' for bit in path_bits):
+            raise ValueError("Invalid path")
+
+        node = self.root_node
+        level = 0
+        while level < depth and isinstance(node, _Branch):
+            node = node.right if path_bits[level] == '1' else node.left
+            level += 1
+
+        # A leaf above the requested depth only covers it if the paths agree
+        if isinstance(node, _Leaf) and level < depth:
+            if node.path >> (self.DEPTH - depth) != int(path_bits, 2):
+                node = None
+
+        result = {
+            'path': path_bits,
+            'depth': depth,
+            'hash': _node_hash(node).hex()
+        }
+
+        if isinstance(node, _Branch):
+            result['type'] = 'branch'
+            result['left'] = _node_hash(node.left).hex()
+            result['right'] = _node_hash(node.right).hex()
+        elif isinstance(node, _Leaf):
+            result['type'] = 'leaf'
+            result['key'] = node.key
+        else:
+            result['type'] = 'empty'
+
+        return result
+
+class IncrementalMerkleTree:
+    """Append-only Merkle tree of fixed depth keeping only the frontier"""
+
+    DEPTH = 32
+
+    zeros = [b'\x00' * 32]
+    for _ in range(DEPTH - 1):
+        zeros.append(_hash_node(zeros[-1], zeros[-1]))
+    del _
+
+    def __init__(self):
+        self.frontier = [None] * self.DEPTH
+        self.size = 0
+
+    def append(self, leaf):
+        """Append a leaf (e.g. a transaction hash) in O(depth)"""
+        if self.size >= 2 ** self.DEPTH:
+            raise ValueError("Merkle tree is full")
+
+        node_hash = _hash(LEAF_PREFIX + leaf.encode('utf-8'))
+        index = self.size
+        for level in range(self.DEPTH):
+            if index & 1 == 0:
+                self.frontier[level] = node_hash
+                break
+            node_hash = _hash_node(self.frontier[level], node_hash)
+            index >>= 1
+
+        self.size += 1
+
+    def root(self):
+        """Get the root hash, padding with empty subtrees"""
+        node_hash = self.zeros[0]
+        index = self.size
+        for level in range(self.DEPTH):
+            if index & 1:
+                node_hash = _hash_node(self.frontier[level], node_hash)
+            else:
+                node_hash = _hash_node(node_hash, self.zeros[level])
+            index >>= 1
+        return node_hash
+
+def state_root(balances_root, transactions_root):
+    """Combine the balance and transaction commitments into one root"""
+    return _hash(STATE_PREFIX + balances_root + transactions_root)
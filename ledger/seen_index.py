@@ -0,0 +1,163 @@
+import hashlib
+import math
+from collections import OrderedDict
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter backed by a bytearray"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        # Optimal bit count and hash count for the requested capacity
+        self.num_bits = max(8, int(math.ceil(
+            -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        )))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        """Yield bit positions for a key using double hashing"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key):
+        """Add a key to the filter"""
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        for pos in self._positions(key):
+            if not self.bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def is_full(self):
+        """Check if the filter reached its design capacity"""
+        return self.count >= self.capacity
+
+    def estimated_error_rate(self):
+        """Estimate the current false-positive rate from the fill level"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def memory_bytes(self):
+        """Get size of the bit array in bytes"""
+        return len(self.bits)
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by chaining filters with tightening error rates"""
+
+    GROWTH_FACTOR = 2
+    TIGHTENING_RATIO = 0.9
+
+    def __init__(self, initial_capacity=1_000_000, error_rate=1e-6):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.filters = []
+        self._add_filter()
+
+    def _add_filter(self):
+        """Append a new filter slice sized for the next growth step"""
+        n = len(self.filters)
+        capacity = self.initial_capacity * (self.GROWTH_FACTOR ** n)
+        # Geometric series keeps the compound error rate below error_rate
+        slice_error = self.error_rate * (1 - self.TIGHTENING_RATIO) * (self.TIGHTENING_RATIO ** n)
+        self.filters.append(BloomFilter(capacity, slice_error))
+
+    def add(self, key):
+        """Add a key, growing the filter when the active slice is full"""
+        if self.filters[-1].is_full():
+            self._add_filter()
+        self.filters[-1].add(key)
+
+    def __contains__(self, key):
+        # Newest slice first, recent keys are the most likely replays
+        for bloom in reversed(self.filters):
+            if key in bloom:
+                return True
+        return False
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    def estimated_error_rate(self):
+        """Estimate the compound false-positive rate across all slices"""
+        miss = 1.0
+        for bloom in self.filters:
+            miss *= 1 - bloom.estimated_error_rate()
+        return 1 - miss
+
+    def memory_bytes(self):
+        """Get total size of all bit arrays in bytes"""
+        return sum(bloom.memory_bytes() for bloom in self.filters)
+
+class SeenTransactionIndex:
+    """Index of seen transaction hashes for O(1) duplicate and replay detection
+
+    Recent hashes are kept in an exact bounded window; every hash also goes
+    into a scalable Bloom filter covering the full history. A hit in the
+    window is a definite replay and skips the Bloom lookup. A hit only in
+    the Bloom filter is a probable replay, wrong at most at the rate
+    reported by get_stats(), and is counted separately so false rejections
+    can be monitored.
+    """
+
+    def __init__(self, window_size=100_000, initial_capacity=1_000_000, error_rate=1e-6):
+        self.window_size = window_size
+        self.recent = OrderedDict()
+        self.history = ScalableBloomFilter(initial_capacity, error_rate)
+        self.exact_hits = 0
+        self.bloom_only_hits = 0
+
+    def add(self, tx_hash):
+        """Record a transaction hash as seen"""
+        if tx_hash in self.recent:
+            return
+        self.recent[tx_hash] = None
+        if len(self.recent) > self.window_size:
+            self.recent.popitem(last=False)
+        self.history.add(tx_hash)
+
+    def is_recent(self, tx_hash):
+        """Check the exact recent window"""
+        return tx_hash in self.recent
+
+    def might_contain(self, tx_hash):
+        """Check the full-history Bloom filter (may give false positives)"""
+        return tx_hash in self.history
+
+    def check(self, tx_hash):
+        """Check if a hash was seen, exact window first, counting hits"""
+        if tx_hash in self.recent:
+            self.exact_hits += 1
+            return True
+
+        if tx_hash in self.history:
+            self.bloom_only_hits += 1
+            return True
+
+        return False
+
+    def get_stats(self):
+        """Get memory usage and false-positive statistics"""
+        # Rough per-entry cost of an OrderedDict slot plus a 64-char hex string
+        window_bytes = len(self.recent) * (100 + 113)
+        bloom_bytes = self.history.memory_bytes()
+
+        return {
+            'total_seen': len(self.history),
+            'window_size': self.window_size,
+            'window_entries': len(self.recent),
+            'bloom_slices': len(self.history.filters),
+            'bloom_memory_bytes': bloom_bytes,
+            'window_memory_bytes': window_bytes,
+            'total_memory_bytes': bloom_bytes + window_bytes,
+            'exact_hits': self.exact_hits,
+            'bloom_only_hits': self.bloom_only_hits,
+            'estimated_false_positive_rate': self.history.estimated_error_rate()
+        }
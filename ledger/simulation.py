@@ -0,0 +1,243 @@
+"""Large-scale FBA consensus simulation with vectorized vote rounds
+
+Usage: python -m ledger.simulation [--num-nodes 2000] [--num-transactions 1000] [--seed 42]
+"""
+import argparse
+import json
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for simulation mode
+    np = None
+
+# accepted_round value for nodes that have not accepted a transaction
+NEVER = 2 ** 40
+
+class SimulationConfig:
+    """Parameters for a network-scale consensus simulation"""
+
+    def __init__(self, num_nodes=2000, num_transactions=1000, slice_size=20,
+                 threshold_ratio=0.67, core_size=50, core_weight=20.0,
+                 latency_ms=80.0, latency_jitter=0.5, message_jitter=0.3, round_ms=10.0,
+                 crash_fraction=0.05, byzantine_fraction=0.02, message_loss=0.01,
+                 vote_probability=0.8, confirm_ratio=0.67, tx_rate=500.0,
+                 max_rounds=1000, stall_rounds=20, batch_size=500, seed=42):
+        self.num_nodes = num_nodes
+        self.num_transactions = num_transactions
+        self.slice_size = slice_size  # trusted peers per node, excluding itself
+        self.threshold_ratio = threshold_ratio  # share of slice needed to accept
+        self.core_size = core_size  # well-known nodes most slices include
+        self.core_weight = core_weight  # how strongly slices prefer core nodes
+        self.latency_ms = latency_ms  # median per-node broadcast latency
+        self.latency_jitter = latency_jitter  # lognormal sigma of latency across nodes
+        self.message_jitter = message_jitter  # lognormal sigma per node and transaction
+        self.round_ms = round_ms  # duration of one vote round
+        self.crash_fraction = crash_fraction  # nodes that never vote
+        self.byzantine_fraction = byzantine_fraction  # nodes that equivocate and never accept
+        self.message_loss = message_loss  # chance a node's broadcast is lost per round
+        self.vote_probability = vote_probability  # chance a node votes directly on arrival
+        self.confirm_ratio = confirm_ratio  # share of all nodes that must accept to confirm
+        self.tx_rate = tx_rate  # transaction arrivals per second
+        self.max_rounds = max_rounds  # rounds after its arrival before a transaction is stalled
+        self.stall_rounds = stall_rounds  # quiet rounds after which a batch is stalled
+        self.batch_size = batch_size  # transactions evaluated per matrix batch
+        self.seed = seed
+
+    def to_dict(self):
+        """Convert config to dictionary"""
+        return dict(self.__dict__)
+
+class NetworkTopology:
+    """Synthetic FBA topology with quorum slices encoded as a matrix"""
+
+    def __init__(self, config, rng):
+        n = config.num_nodes
+        self.num_nodes = n
+
+        # Weighted sampling without replacement (Efraimidis-Spirakis):
+        # the slice_size largest keys u ** (1 / weight) form each slice
+        weights = np.ones(n)
+        weights[:min(config.core_size, n)] = config.core_weight
+        keys = rng.random((n, n)) ** (1.0 / weights)
+        np.fill_diagonal(keys, -1.0)
+
+        slice_size = min(config.slice_size, n - 1)
+        members = np.argpartition(-keys, slice_size - 1, axis=1)[:, :slice_size]
+        del keys
+
+        # slices[i, j] == 1 when node i trusts peer j; a node's own vote
+        # also counts toward its threshold but needs no broadcast
+        self.slices = np.zeros((n, n), dtype=np.float32)
+        np.put_along_axis(self.slices, members, 1.0, axis=1)
+        self.thresholds = np.full(n, math.ceil(config.threshold_ratio * (slice_size + 1)), dtype=np.float32)
+
+        # Fault model: crashed nodes are silent, byzantine nodes equivocate
+        roles = rng.permutation(n)
+        num_crashed = int(config.crash_fraction * n)
+        num_byzantine = int(config.byzantine_fraction * n)
+        self.crashed = np.zeros(n, dtype=bool)
+        self.crashed[roles[:num_crashed]] = True
+        self.byzantine = np.zeros(n, dtype=bool)
+        self.byzantine[roles[num_crashed:num_crashed + num_byzantine]] = True
+        self.honest = ~(self.crashed | self.byzantine)
+
+        # Byzantine nodes vote for every transaction at once but send half of
+        # the peers trusting them a conflicting vote instead; conflicting[i, k]
+        # == 1 when node i receives the conflicting vote of byzantine node k
+        self.byzantine_nodes = np.flatnonzero(self.byzantine)
+        self.conflicting = self.slices[:, self.byzantine_nodes] * (
+            rng.random((n, len(self.byzantine_nodes))) < 0.5
+        )
+
+        # Latency model: lognormal median broadcast latency per node
+        self.latency_ms = rng.lognormal(math.log(config.latency_ms), config.latency_jitter, n)
+
+    def get_stats(self):
+        """Get topology statistics"""
+        in_degree = self.slices.sum(axis=0)
+        return {
+            'nodes': self.num_nodes,
+            'honest_nodes': int(self.honest.sum()),
+            'crashed_nodes': int(self.crashed.sum()),
+            'byzantine_nodes': int(self.byzantine.sum()),
+            'max_trusted_by': int(in_degree.max()),
+            'median_trusted_by': float(np.median(in_degree)),
+            'median_latency_ms': float(np.median(self.latency_ms))
+        }
+
+class NetworkSimulator:
+    """Evaluates vote rounds for many transactions at once
+
+    Node state is a nodes x transactions matrix of the round each node
+    accepted each transaction. Every round, the votes visible to each node
+    are counted for all transactions with one matrix product against the
+    slice matrix, and nodes whose slice threshold is met accept.
+    """
+
+    def __init__(self, config=None):
+        if np is None:
+            raise ImportError("Simulation mode requires numpy (install the 'sim' extra)")
+
+        self.config = config or SimulationConfig()
+        self.rng = np.random.default_rng(self.config.seed)
+        self.topology = NetworkTopology(self.config, self.rng)
+
+    def _run_batch(self, arrival):
+        """Run vote rounds for one batch of transactions
+
+        Direct votes only seed the process: a node accepts a transaction
+        once the votes visible from its slice reach its threshold, then
+        votes for it too. A transaction is confirmed when confirm_ratio of
+        all nodes have accepted it. Byzantine votes only count for the
+        peers not sent a conflicting vote, and byzantine nodes never accept.
+        """
+        config = self.config
+        topology = self.topology
+        n, t = topology.num_nodes, len(arrival)
+
+        honest = topology.honest[:, None]
+        jitter = self.rng.lognormal(0.0, config.message_jitter, (n, t))
+        delay = np.maximum(1, np.ceil(topology.latency_ms[:, None] * jitter / config.round_ms)).astype(np.int64)
+        needed = math.ceil(config.confirm_ratio * n)
+
+        # Honest nodes vote directly once the transaction reaches them,
+        # byzantine nodes always do
+        direct = (self.rng.random((n, t)) < config.vote_probability) & honest
+        direct[topology.byzantine_nodes] = True
+        voted_round = np.where(direct, arrival[None, :] + delay, NEVER)
+        accepted = np.zeros((n, t), dtype=bool)
+        confirm_round = np.full(t, -1, dtype=np.int64)
+
+        # Each transaction may only confirm within max_rounds of its arrival
+        deadline = arrival + config.max_rounds
+
+        quiet = 0
+        for r in range(int(arrival.min()), int(deadline.max())):
+            # A vote reaches peers one broadcast delay after it is cast
+            delivered = self.rng.random((n, t)) >= config.message_loss
+            visible = ((voted_round + delay <= r) & delivered).astype(np.float32)
+
+            support = topology.slices @ visible + (voted_round <= r)
+            support -= topology.conflicting @ visible[topology.byzantine_nodes]
+            newly = (support >= topology.thresholds[:, None]) & honest & ~accepted
+            newly &= arrival[None, :] <= r
+            accepted |= newly
+            voted_round[newly & (voted_round > r)] = r
+
+            done = (accepted.sum(axis=0) >= needed) & (r < deadline)
+            confirm_round[done & (confirm_round < 0)] = r
+
+            if ((confirm_round >= 0) | (deadline <= r + 1)).all():
+                break
+
+            # Stalled once all votes have landed and nothing changes for a while
+            in_flight = ((voted_round < NEVER) & (voted_round + delay > r)).any()
+            quiet = 0 if newly.any() or in_flight else quiet + 1
+            if quiet >= config.stall_rounds:
+                break
+
+        return confirm_round
+
+    def run(self):
+        """Run the simulation and report latency and throughput"""
+        config = self.config
+        started = time.perf_counter()
+
+        # Poisson arrivals at tx_rate, quantized to rounds
+        gaps = self.rng.exponential(1000.0 / config.tx_rate, config.num_transactions)
+        arrival = (np.cumsum(gaps) // config.round_ms).astype(np.int64)
+
+        confirm_round = np.empty(config.num_transactions, dtype=np.int64)
+        for start in range(0, config.num_transactions, config.batch_size):
+            batch = slice(start, start + config.batch_size)
+            confirm_round[batch] = self._run_batch(arrival[batch])
+
+        confirmed = confirm_round >= 0
+        latency_ms = (confirm_round[confirmed] - arrival[confirmed]) * config.round_ms
+
+        if confirmed.any():
+            duration_ms = (confirm_round[confirmed].max() - arrival.min() + 1) * config.round_ms
+            percentiles = np.percentile(latency_ms, [50, 90, 99])
+            latency = {
+                'mean': float(latency_ms.mean()),
+                'p50': float(percentiles[0]),
+                'p90': float(percentiles[1]),
+                'p99': float(percentiles[2]),
+                'max': float(latency_ms.max())
+            }
+            histogram, edges = np.histogram(latency_ms, bins=10)
+            distribution = [
+                {'from_ms': float(edges[i]), 'to_ms': float(edges[i + 1]), 'count': int(histogram[i])}
+                for i in range(len(histogram))
+            ]
+        else:
+            duration_ms = 0.0
+            latency = None
+            distribution = []
+
+        return {
+            'config': config.to_dict(),
+            'topology': self.topology.get_stats(),
+            'confirmed_transactions': int(confirmed.sum()),
+            'stalled_transactions': int((~confirmed).sum()),
+            'confirmation_latency_ms': latency,
+            'latency_distribution': distribution,
+            'simulated_duration_ms': float(duration_ms),
+            'throughput_tps': float(confirmed.sum() / (duration_ms / 1000.0)) if duration_ms else 0.0,
+            'wall_time_s': time.perf_counter() - started
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    defaults = SimulationConfig()
+    for name, value in defaults.to_dict().items():
+        parser.add_argument('--' + name.replace('_', '-'), type=type(value), default=value)
+    args = parser.parse_args()
+
+    report = NetworkSimulator(SimulationConfig(**vars(args))).run()
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
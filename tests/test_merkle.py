@@ -0,0 +1,72 @@
+from ledger.blockchain import SimpleLedger
+from ledger.merkle import SparseMerkleTree
+
+def funded_ledger(count=50):
+    ledger = SimpleLedger()
+    for i in range(count):
+        address = f"fba_{i:040d}"
+        ledger.balances[address] = 10.0 + i
+        ledger._commit_balance(address)
+    return ledger
+
+def test_inclusion_proof_verifies():
+    ledger = funded_ledger()
+    response = ledger.get_balance_proof("fba_" + "7".zfill(40))
+
+    assert response['balance'] == 17.0
+    assert SimpleLedger.verify_balance_proof(response)
+
+def test_inclusion_proof_rejects_wrong_balance():
+    ledger = funded_ledger()
+    response = ledger.get_balance_proof("fba_" + "7".zfill(40))
+    response['balance'] = 1000.0
+
+    assert not SimpleLedger.verify_balance_proof(response)
+
+def test_absence_proof_verifies():
+    ledger = funded_ledger()
+    response = ledger.get_balance_proof("fba_unknown")
+
+    assert response['balance'] == 0.0
+    assert SimpleLedger.verify_balance_proof(response)
+
+def test_absence_proof_rejects_empty_leaf_value():
+    ledger = funded_ledger()
+    response = ledger.get_balance_proof("fba_unknown")
+    if 'leaf' not in response['proof']:
+        response = next(
+            proof for proof in (ledger.get_balance_proof(f"fba_unknown_{i}") for i in range(100))
+            if 'leaf' in proof['proof']
+        )
+    response['proof']['leaf']['value'] = ''
+
+    assert not SimpleLedger.verify_balance_proof(response)
+
+def test_forged_absence_proof_is_rejected():
+    ledger = funded_ledger()
+    target = "fba_" + "3".zfill(40)
+    path = SparseMerkleTree.key_path(target)
+    bit = SparseMerkleTree._bit(path, 0)
+
+    # Any other funded address on the same side of the root
+    other = next(
+        address for address in ledger.balances
+        if address != target and SparseMerkleTree._bit(SparseMerkleTree.key_path(address), 0) == bit
+    )
+
+    root = ledger.get_state_node('')
+    own_side, sibling = (root['right'], root['left']) if bit else (root['left'], root['right'])
+    honest = ledger.get_balance_proof(target)
+
+    # Claim the target is absent by passing its whole subtree off as a leaf
+    forged = dict(honest, balance=0.0, proof={
+        'key': target,
+        'depth': 1,
+        'bitmap': '1',
+        'siblings': [sibling],
+        'leaf': {'key': other, 'hash': own_side}
+    })
+    assert not SimpleLedger.verify_balance_proof(forged)
+
+    forged['proof']['leaf'] = {'key': other, 'value': own_side}
+    assert not SimpleLedger.verify_balance_proof(forged)
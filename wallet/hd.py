@@ -0,0 +1,146 @@
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from nacl.signing import SigningKey
+from nacl.encoding import HexEncoder
+from wallet.keys import KeyManager
+from wallet.address import AddressManager
+
+# Shared worker pool for large batches, created on first use
+_executor = None
+_executor_workers = 0
+
+def _get_executor(processes):
+    """Get the shared process pool, recreating it if the size changes"""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != processes:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(max_workers=processes)
+        _executor_workers = processes
+    return _executor
+
+def _derive_range(seed_hex, start, count):
+    """Derive indexed accounts for a contiguous index range"""
+    accounts = []
+    private_seeds = KeyManager.derive_private_seeds(seed_hex, start, count)
+
+    for index, private_seed in enumerate(private_seeds, start):
+        private_key = SigningKey(private_seed)
+        public_key = private_key.verify_key.encode(encoder=HexEncoder).decode('utf-8')
+        accounts.append({
+            'index': index,
+            'private_key': private_key.encode(encoder=HexEncoder).decode('utf-8'),
+            'public_key': public_key,
+            'address': AddressManager.public_key_to_address(public_key)
+        })
+
+    return accounts
+
+class DeterministicWallet:
+    """Deterministic wallet deriving indexed accounts from a single seed"""
+
+    # Below this many accounts a process pool costs more than it saves
+    MIN_PARALLEL_BATCH = 2000
+
+    def __init__(self, seed_hex, registry=None):
+        seed_bytes = bytes.fromhex(seed_hex)
+        if len(seed_bytes) != 32:
+            raise ValueError("Seed must be 32 bytes")
+
+        self.seed = seed_hex
+        # Identifies the wallet without revealing its seed
+        self.wallet_id = hashlib.blake2b(b'wallet_id' + seed_bytes, digest_size=16).hexdigest()
+        self.registry = registry
+        self.address_index = {}  # address -> index
+
+    def _remember(self, accounts):
+        """Record derived addresses for reverse lookup"""
+        for account in accounts:
+            self.address_index[account['address']] = account['index']
+            if self.registry is not None:
+                self.registry.record(account['address'], self.wallet_id, account['index'])
+        return accounts
+
+    def derive(self, index):
+        """Derive the account at an index"""
+        keypair = KeyManager.keypair_from_seed_index(self.seed, index)
+        return self._remember([{
+            'index': index,
+            'private_key': keypair['private_key'],
+            'public_key': keypair['public_key'],
+            'address': AddressManager.public_key_to_address(keypair['public_key'])
+        }])[0]
+
+    def derive_batch(self, start=0, count=1000, processes=None):
+        """Derive count consecutive accounts starting at start
+
+        With processes set, large batches are split into chunks and
+        derived in a process pool shared by all wallets, started on the
+        first parallel batch and reused afterwards.
+        """
+        if not processes or processes < 2 or count < self.MIN_PARALLEL_BATCH:
+            return self._remember(_derive_range(self.seed, start, count))
+
+        chunk_size = -(-count // processes)
+        chunks = [
+            (chunk_start, min(chunk_size, start + count - chunk_start))
+            for chunk_start in range(start, start + count, chunk_size)
+        ]
+
+        executor = _get_executor(processes)
+        futures = [
+            executor.submit(_derive_range, self.seed, chunk_start, chunk_count)
+            for chunk_start, chunk_count in chunks
+        ]
+
+        accounts = []
+        for future in futures:
+            accounts.extend(future.result())
+
+        return self._remember(accounts)
+
+    def index_of(self, address):
+        """Get the index of a previously derived address, or None"""
+        return self.address_index.get(address)
+
+class WalletRegistry:
+    """Reverse lookup from derived addresses to their wallet and index
+
+    Only the wallet id and index of each address are kept, never the seed.
+    The map is bounded: once max_addresses is reached the least recently
+    derived or resolved address is evicted. Lookups are O(1), so incoming
+    payments can be matched to accounts.
+    """
+
+    def __init__(self, max_addresses=100_000):
+        self.max_addresses = max_addresses
+        self.addresses = OrderedDict()  # address -> (wallet_id, index)
+
+    def get_wallet(self, seed_hex):
+        """Get a wallet for a seed whose derived addresses are recorded here"""
+        return DeterministicWallet(seed_hex, registry=self)
+
+    def record(self, address, wallet_id, index):
+        """Record a derived address, evicting the least recently used"""
+        self.addresses[address] = (wallet_id, index)
+        self.addresses.move_to_end(address)
+        if len(self.addresses) > self.max_addresses:
+            self.addresses.popitem(last=False)
+
+    def resolve(self, address):
+        """Get the wallet id and index of a derived address, or None"""
+        entry = self.addresses.get(address)
+        if entry is None:
+            return None
+
+        self.addresses.move_to_end(address)
+        wallet_id, index = entry
+        return {
+            'address': address,
+            'wallet_id': wallet_id,
+            'index': index
+        }
+
+# Global wallet registry instance
+wallet_registry = WalletRegistry()
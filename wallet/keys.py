@@ -36,6 +36,28 @@ class KeyManager:
             'public_key': public_key.encode(encoder=HexEncoder).decode('utf-8')
         }
     
+    @staticmethod
+    def derive_private_seeds(seed_hex, start=0, count=1):
+        """Derive per-index private key seeds, Nano style: blake2b(seed || index)"""
+        if start < 0 or count < 0 or start + count > 2 ** 32:
+            raise ValueError("Index must be between 0 and 2^32 - 1")
+        
+        # Absorb the seed once and copy the hashing state for every index
+        base = hashlib.blake2b(bytes.fromhex(seed_hex), digest_size=32)
+        
+        seeds = []
+        for index in range(start, start + count):
+            hasher = base.copy()
+            hasher.update(index.to_bytes(4, 'big'))
+            seeds.append(hasher.digest())
+        return seeds
+    
+    @staticmethod
+    def keypair_from_seed_index(seed_hex, index):
+        """Derive the keypair at an index of a deterministic wallet seed"""
+        private_seed = KeyManager.derive_private_seeds(seed_hex, index)[0]
+        return KeyManager.keypair_from_seed(private_seed.hex())
+    
     @staticmethod
     def sign_message(private_key_hex, message):
         """Sign a message with private key"""
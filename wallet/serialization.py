@@ -0,0 +1,34 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is the optional 'fast-json' extra
+    orjson = None
+
+def dumps(obj, default=None, sort_keys=False):
+    """Serialize an object to compact JSON bytes"""
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(obj, default=default, option=option)
+
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, separators=(',', ':')
+    ).encode('utf-8')
+
+def loads(data):
+    """Deserialize JSON text or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def join_fragments(fragments):
+    """Join pre-encoded JSON values into a JSON array"""
+    return b'[' + b','.join(fragments) + b']'
+
+def extend_fragment(fragment, **fields):
+    """Add fields to a pre-encoded JSON object without decoding it"""
+    if not fields:
+        return fragment
+    if fragment == b'{}':
+        return dumps(fields)
+    return fragment[:-1] + b',' + dumps(fields)[1:]
@@ -1,7 +1,9 @@
 import json
 import time
 import hashlib
+import secrets
 from wallet.keys import KeyManager
+from wallet.serialization import dumps
 
 class Transaction:
     """Represents a transaction in the FBA network"""
@@ -13,7 +15,10 @@ class Transaction:
         self.timestamp = timestamp or int(time.time())
         self.signature = None
         self.hash = None
-        self.nonce = 0
+        # Random starting nonce keeps otherwise identical transactions distinct
+        self.nonce = secrets.randbits(32)
+        self.confirmed = False
+        self._json = None
         
     def to_dict(self):
         """Convert transaction to dictionary"""
@@ -27,6 +32,27 @@ class Transaction:
             'nonce': self.nonce
         }
     
+    def to_json(self):
+        """Encode transaction as JSON bytes, cached once confirmed"""
+        if self._json is not None:
+            return self._json
+        
+        # Sorted keys match Flask's default JSON provider
+        encoded = dumps(self.to_dict(), sort_keys=True)
+        # Confirmed transactions are immutable, so their encoding never changes
+        if self.confirmed:
+            self._json = encoded
+        return encoded
+    
+    def mark_confirmed(self):
+        """Mark transaction as confirmed and immutable"""
+        self.confirmed = True
+        self.clear_json_cache()
+    
+    def clear_json_cache(self):
+        """Drop the cached JSON encoding"""
+        self._json = None
+    
     def calculate_hash(self):
         """Calculate transaction hash"""
         tx_string = f"{self.from_address}{self.to_address}{self.amount}{self.timestamp}{self.nonce}"